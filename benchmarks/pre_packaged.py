@@ -0,0 +1,37 @@
+"""
+Compares loading the pre-packaged wrapper configs from json with loading them from the compiled artifact cache.
+
+    PYTHONPATH=src python benchmarks/pre_packaged.py
+"""
+
+import os
+from tempfile import TemporaryDirectory
+from timeit import repeat
+
+from cli_wrapper.pre_packaged import get_wrapper
+
+WRAPPERS = ["kubectl", "helm", "docker"]
+
+
+def best_ms(func, number=10):
+    return min(repeat(func, number=number, repeat=5)) / number * 1000
+
+
+def main():
+    with TemporaryDirectory() as cache:
+        os.environ["CLI_WRAPPER_CACHE_DIR"] = cache
+        print("ms per get_wrapper call")
+        print(f"{'wrapper':<10}{'json':>10}{'cached':>10}{'json lazy':>12}{'cached lazy':>14}")
+        for name in WRAPPERS:
+            get_wrapper(name)  # build the artifact
+            results = [
+                best_ms(lambda: get_wrapper(name, cache=False)),
+                best_ms(lambda: get_wrapper(name)),
+                best_ms(lambda: get_wrapper(name, cache=False, lazy=True)),
+                best_ms(lambda: get_wrapper(name, lazy=True)),
+            ]
+            print(f"{name:<10}" + "".join(f"{r:>{w}.2f}" for r, w in zip(results, [10, 10, 12, 14])))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+The server side of `cli_wrapper.launchers.ForkServerLauncher`. This runs as a standalone script (with `python -S`) so it
+stays as small as possible: it only imports the standard library, not cli_wrapper or its dependencies.
+
+Requests arrive on the unix socket passed as the first argument: an 8 byte big-endian payload length sent along with
+the child's stdout/stderr pipe fds, followed by a marshalled (request id, argv, env) payload. Each request is spawned
+with posix_spawn, and a marshalled (request id, exit code, error) reply is sent when the child exits.
+"""
+
+import marshal
+import os
+import socket
+import struct
+import sys
+from threading import Lock, Thread
+
+_HEADER = struct.Struct(">Q")
+
+
+def _recv_exactly(sock, size):
+    data = bytearray()
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise EOFError()
+        data.extend(chunk)
+    return bytes(data)
+
+
+def _recv_request(sock):
+    header, fds, _, _ = socket.recv_fds(sock, _HEADER.size, 2, getattr(socket, "MSG_CMSG_CLOEXEC", 0))
+    if not header:
+        raise EOFError()
+    for fd in fds:
+        os.set_inheritable(fd, False)
+    header += _recv_exactly(sock, _HEADER.size - len(header))
+    return marshal.loads(_recv_exactly(sock, _HEADER.unpack(header)[0])), fds
+
+
+def _reply(sock, lock, message):
+    payload = marshal.dumps(message)
+    with lock:
+        sock.sendall(_HEADER.pack(len(payload)) + payload)
+
+
+def _wait(sock, lock, request_id, pid):
+    _, status = os.waitpid(pid, 0)
+    _reply(sock, lock, (request_id, os.waitstatus_to_exitcode(status), None))
+
+
+def serve(sock):
+    lock = Lock()
+    while True:
+        try:
+            (request_id, argv, env), fds = _recv_request(sock)
+        except (EOFError, ConnectionError):
+            return
+        stdout, stderr = fds
+        try:
+            pid = os.posix_spawnp(
+                argv[0],
+                argv,
+                env,
+                file_actions=[
+                    (os.POSIX_SPAWN_OPEN, 0, os.devnull, os.O_RDONLY, 0),
+                    (os.POSIX_SPAWN_DUP2, stdout, 1),
+                    (os.POSIX_SPAWN_DUP2, stderr, 2),
+                ],
+            )
+        except OSError as err:
+            _reply(sock, lock, (request_id, None, (err.errno, err.strerror, argv[0])))
+            continue
+        finally:
+            os.close(stdout)
+            os.close(stderr)
+        Thread(target=_wait, args=(sock, lock, request_id, pid), daemon=True).start()
+
+
+if __name__ == "__main__":
+    serve(socket.socket(fileno=int(sys.argv[1])))
@@ -2,18 +2,25 @@ import asyncio.subprocess
 import logging
 import os
 import subprocess
-from copy import copy
+from codecs import getincrementaldecoder
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from copy import deepcopy
 from itertools import chain
-from typing import Callable
+from tempfile import TemporaryFile
+from typing import Callable, Mapping
 
-from attrs import define, field
+from attrs import define, field, setters
 
+from .launchers import Launcher, SubprocessLauncher
 from .parsers import Parser
 from .transformers import transformers
+from .util.result_cache import ResultCache
 from .validators import validators, Validator
 
 _logger = logging.getLogger(__name__)
 
+_STREAM_CHUNK_SIZE = 64 * 1024
+
 
 @define
 class Argument:
@@ -105,7 +112,91 @@ def _arg_converter(value: dict):
     return value
 
 
-@define
+def _reset_argv_builder(instance, attribute, value):
+    """
+    on_setattr hook for `Command`: any change to the command discards its compiled argv builder
+    """
+    if attribute.name != "_argv_builder":
+        object.__setattr__(instance, "_argv_builder", None)
+    return value
+
+
+class _ArgvBuilder:  # pylint: disable=too-few-public-methods,too-many-instance-attributes
+    """
+    Precompiled form of `Command.build_args`. Literal names, transformers, prefixes and the separator are resolved once,
+    so building an argv only needs to substitute values.
+    """
+
+    def __init__(self, command):
+        self.cli_command = list(command.cli_command)
+        self.default_flags = command.default_flags
+        self.default_transformer = transformers.get(command.default_transformer)
+        self.args = {}
+        for key, arg in command.args.items():
+            literal_name = arg.literal_name if arg.literal_name is not None else key
+            transformer = transformers.get(arg.transformer) if arg.transformer is not None else None
+            self.args[key] = (literal_name, transformer)
+        self.short_prefix = command.short_prefix
+        self.long_prefix = command.long_prefix
+        self.arg_separator = command.arg_separator
+        self.flags = {}
+
+    def flag(self, name: str) -> str:
+        """
+        :param name: the transformed argument name
+        :return: the name with its prefix, memoized per name
+        """
+        flag = self.flags.get(name)
+        if flag is None:
+            flag = self.flags[name] = f"{self.long_prefix if len(name) > 1 else self.short_prefix}{name}"
+        return flag
+
+    def __call__(self, args, kwargs):
+        positional = self.cli_command.copy()
+        params = []
+        default_flags = ((k, v) for k, v in self.default_flags.items() if k not in kwargs)
+        for arg, value in chain(enumerate(args), kwargs.items(), default_flags):
+            compiled = self.args.get(arg)
+            if compiled is None:
+                arg, value = self.default_transformer(arg, value)
+            elif compiled[1] is not None:
+                arg, value = compiled[1](compiled[0], value)
+            else:
+                arg = compiled[0]
+            if isinstance(arg, str):
+                if value is None or isinstance(value, bool):
+                    params.append(self.flag(arg))
+                elif self.arg_separator != " ":
+                    params.append(f"{self.flag(arg)}{self.arg_separator}{value}")
+                else:
+                    params.extend([self.flag(arg), value])
+            else:
+                positional.append(value)
+        return positional + params
+
+
+_MUTATING_VERBS = frozenset(
+    [
+        "add", "annotate", "apply", "attach", "autoscale", "build", "commit", "cordon", "cp", "create", "delete",
+        "deploy", "destroy", "disable", "drain", "edit", "enable", "exec", "expose", "import", "init", "install",
+        "kill", "label", "load", "login", "logout", "patch", "pause", "prune", "pull", "push", "remove", "rename",
+        "replace", "reset", "restart", "rm", "rmi", "rollback", "rollout", "run", "scale", "set", "start", "stop",
+        "tag", "taint", "uncordon", "uninstall", "unpause", "update", "upgrade", "use", "write",
+    ]
+)  # fmt: skip
+""" Commands containing these words (or words like `set-context` that start with them) are never cached """
+
+
+def _is_mutating(words) -> bool:
+    return any(isinstance(w, str) and (w in _MUTATING_VERBS or w.split("-")[0] in _MUTATING_VERBS) for w in words)
+
+
+def _cache_validator(instance, _, value):
+    if value is not None and _is_mutating(instance.cli_command):
+        raise ValueError(f"Command {' '.join(instance.cli_command)} looks like it changes state and can't be cached")
+
+
+@define(on_setattr=[setters.convert, setters.validate, _reset_argv_builder])
 class Command:  # pylint: disable=too-many-instance-attributes
     """
     Command represents a command to be run with the cli_wrapper
@@ -127,6 +218,9 @@ class Command:  # pylint: disable=too-many-instance-attributes
     """ @private """
     arg_separator: str = field(repr=False, default="=")
     """ @private """
+    cache: ResultCache = field(converter=ResultCache.from_dict, validator=_cache_validator, default=None)
+    """ @private """
+    _argv_builder: _ArgvBuilder = field(init=False, default=None, repr=False, eq=False)
 
     @classmethod
     def from_dict(cls, command_dict, **kwargs):
@@ -163,6 +257,7 @@ class Command:  # pylint: disable=too-many-instance-attributes
             "default_flags": self.default_flags,
             "args": {k: v.to_dict() for k, v in self.args.items()},
             "parse": self.parse.to_dict() if self.parse is not None else None,
+            "cache": self.cache.to_dict() if self.cache is not None else None,
         }
 
     def validate_args(self, *args, **kwargs):
@@ -181,35 +276,60 @@ class Command:  # pylint: disable=too-many-instance-attributes
                 if not v:
                     raise ValueError(f"Value '{arg}' is invalid for command {' '.join(self.cli_command)} arg {name}")
 
+    def compile(self):
+        """
+        Resolves transformers, literal names, prefixes and the separator once, and caches the resulting argv builder.
+        `build_args` calls this lazily; the cache is discarded whenever an attribute of the command is set.
+        :return: the compiled argv builder
+        """
+        if self._argv_builder is None:
+            self._argv_builder = _ArgvBuilder(self)
+        return self._argv_builder
+
     def build_args(self, *args, **kwargs):
-        positional = copy(self.cli_command) if self.cli_command is not None else []
-        params = []
-        for arg, value in chain(
-            enumerate(args), kwargs.items(), [(k, v) for k, v in self.default_flags.items() if k not in kwargs]
-        ):
-            _logger.debug(f"arg: {arg}, value: {value}")
-            if arg in self.args:
-                literal_arg = self.args[arg].literal_name if self.args[arg].literal_name is not None else arg
-                arg, value = self.args[arg].transform(literal_arg, value)
-            else:
-                arg, value = transformers.get(self.default_transformer)(arg, value)
-            _logger.debug(f"after: arg: {arg}, value: {value}")
-            if isinstance(arg, str):
-                prefix = self.long_prefix if len(arg) > 1 else self.short_prefix
-                if value is not None and not isinstance(value, bool):
-                    if self.arg_separator != " ":
-                        params.append(f"{prefix}{arg}{self.arg_separator}{value}")
-                    else:
-                        params.extend([f"{prefix}{arg}", value])
-                else:
-                    params.append(f"{prefix}{arg}")
-            else:
-                positional.append(value)
-        result = positional + params
+        result = self.compile()(args, kwargs)
         _logger.debug(result)
         return result
 
 
+_MISSING = object()
+
+
+def _copy_result(result):
+    """
+    Copies a parsed result unless it is immutable, so callers sharing a result can't affect each other
+    """
+    if isinstance(result, (str, bytes, int, float, bool, type(None))):
+        return result
+    return deepcopy(result)
+
+
+def _command_from_config(command: str, config: dict | str, command_config: dict) -> Command:
+    """
+    Builds a command from its configuration in a wrapper dict
+    :param command: the command name
+    :param config: the command configuration, or a string with the cli command
+    :param command_config: the wrapper's prefixes, separator and default transformer
+    """
+    if isinstance(config, str):
+        config = {"cli_command": config}
+    else:
+        if "cli_command" not in config:
+            config["cli_command"] = command
+        config = command_config | config
+    return Command.from_dict(config)
+
+
+def _call_spec(call) -> tuple[str | None, tuple, dict]:
+    """
+    Normalizes a call for `CLIWrapper.map_` to a (command, args, kwargs) tuple
+    """
+    if call is None or isinstance(call, str):
+        return call, (), {}
+    command, *rest = call
+    return command, tuple(rest[0]) if rest else (), dict(rest[1]) if len(rest) > 1 else {}
+
+
 @define
 class CLIWrapper:  # pylint: disable=too-many-instance-attributes
     """
@@ -227,13 +347,18 @@ class CLIWrapper:  # pylint: disable=too-many-instance-attributes
     :param long_prefix: The string prefix for arguments longer than 1 letter
     :param arg_separator: The character that separates argument values from names. Defaults to '=', so
       wrapper.command(arg=value) would become "wrapper command --arg=value"
+    :param max_concurrency: The default number of subprocesses `map_` and `gather_` will run at once.
+    :param coalesce: If True, identical concurrent calls on an async wrapper share one subprocess and its parsed result.
+      Each caller receives its own copy of mutable results. Calls that look like they change state are never shared.
+    :param launcher: The `cli_wrapper.launchers.Launcher` that starts subprocesses. Defaults to a
+      `cli_wrapper.launchers.SubprocessLauncher`. Streams always use subprocess directly.
     """
 
     path: str
     """ @private """
     env: dict[str, str] = None
     """ @private """
-    _commands: dict[str, Command] = {}
+    _commands: dict[str, Command] = field(factory=dict)
     """ @private """
 
     trusting: bool = True
@@ -250,6 +375,14 @@ class CLIWrapper:  # pylint: disable=too-many-instance-attributes
     """ @private """
     arg_separator: str = "="
     """ @private """
+    max_concurrency: int = 8
+    """ @private """
+    coalesce: bool = False
+    """ @private """
+    launcher: Launcher = field(factory=SubprocessLauncher, repr=False)
+    """ @private """
+    _inflight: dict = field(init=False, factory=dict, repr=False, eq=False)
+    _command_configs: Mapping[str, dict] = field(init=False, factory=dict, repr=False, eq=False)
 
     def _get_command(self, command: str):
         """
@@ -257,6 +390,14 @@ class CLIWrapper:  # pylint: disable=too-many-instance-attributes
         :param command: the command to be run
         :return:
         """
+        if command not in self._commands and command in self._command_configs:
+            command_config = {
+                "arg_separator": self.arg_separator,
+                "default_transformer": self.default_transformer,
+                "short_prefix": self.short_prefix,
+                "long_prefix": self.long_prefix,
+            }
+            self._commands[command] = _command_from_config(command, self._command_configs[command], command_config)
         if command not in self._commands:
             if not self.trusting:
                 raise ValueError(f"Command {command} not found in {self.path}")
@@ -278,6 +419,7 @@ class CLIWrapper:  # pylint: disable=too-many-instance-attributes
         args: dict[str | int, any] = None,
         default_flags: dict = None,
         parse=None,
+        cache: dict | bool = None,
     ):
         """
         update the command to be run with the cli_wrapper
@@ -286,6 +428,8 @@ class CLIWrapper:  # pylint: disable=too-many-instance-attributes
         :param args: the arguments passed to the command
         :param default_flags: default flags to be used with the command
         :param parse: function to parse the output of the command
+        :param cache: cache parsed results of the command. True for the defaults, or a dict of `ttl` (seconds) and
+          `max_entries`. See `cli_wrapper.util.result_cache.ResultCache`. Commands that change state can't be cached.
         :return:
         """
         self._commands[command] = Command(
@@ -293,41 +437,174 @@ class CLIWrapper:  # pylint: disable=too-many-instance-attributes
             args=args if args is not None else {},
             default_flags=default_flags if default_flags is not None else {},
             parse=parse,
+            cache=cache,
             default_transformer=self.default_transformer,
             short_prefix=self.short_prefix,
             long_prefix=self.long_prefix,
             arg_separator=self.arg_separator,
         )
 
-    def _run(self, command: str, *args, **kwargs):
+    def _prepare(self, command: str, args, kwargs):
+        """
+        Validates the arguments and builds the command line and environment for a call
+        :return: the Command, the argv and the environment
+        """
         command_obj = self._get_command(command)
         command_obj.validate_args(*args, **kwargs)
         command_args = [self.path] + command_obj.build_args(*args, **kwargs)
         env = os.environ.copy().update(self.env if self.env is not None else {})
         _logger.debug(f"Running command: {' '.join(command_args)}")
+        return command_obj, command_args, env
+
+    def _call_key(self, command_args):
+        """
+        :return: a hashable key identifying a call by its argv and environment
+        """
+        return tuple(command_args), tuple(sorted(self.env.items())) if self.env else ()
+
+    def _cache_key(self, command_obj: Command, args, command_args):
+        """
+        :return: the result cache key for a call, or None if the call shouldn't be cached
+        """
+        if command_obj.cache is None or _is_mutating(args):
+            return None
+        return self._call_key(command_args)
+
+    def _run(self, command: str, *args, **kwargs):
+        command_obj, command_args, env = self._prepare(command, args, kwargs)
+        cache_key = self._cache_key(command_obj, args, command_args)
+        if cache_key is not None:
+            cached = command_obj.cache.get(cache_key, _MISSING)
+            if cached is not _MISSING:
+                return _copy_result(cached)
         # run the command
-        result = subprocess.run(command_args, capture_output=True, text=True, env=env, check=self.raise_exc)
+        result = self.launcher.run(command_args, env)
+        if self.raise_exc:
+            result.check_returncode()
         if result.returncode != 0:
-            raise RuntimeError(f"Command {command} failed with error: {result.stderr}")
-        return command_obj.parse(result.stdout)
+            raise RuntimeError(f"Command {command} failed with error: {result.stderr.decode()}")
+        parsed = command_obj.parse(result.stdout.decode())
+        if cache_key is not None:
+            command_obj.cache.put(cache_key, _copy_result(parsed))
+        return parsed
 
     async def _run_async(self, command: str, *args, **kwargs):
-        command_obj = self._get_command(command)
-        command_obj.validate_args(*args, **kwargs)
-        command_args = [self.path] + list(command_obj.build_args(*args, **kwargs))
-        env = os.environ.copy().update(self.env if self.env is not None else {})
-        _logger.debug(f"Running command: {', '.join(command_args)}")
+        command_obj, command_args, env = self._prepare(command, args, kwargs)
+        cache_key = self._cache_key(command_obj, args, command_args)
+        if cache_key is not None:
+            cached = command_obj.cache.get(cache_key, _MISSING)
+            if cached is not _MISSING:
+                return _copy_result(cached)
+        if self.coalesce and not _is_mutating(chain(command_obj.cli_command, args)):
+            parsed = await self._coalesced(command, command_obj, command_args, env)
+        else:
+            parsed = await self._execute_async(command, command_obj, command_args, env)
+        if cache_key is not None:
+            command_obj.cache.put(cache_key, _copy_result(parsed))
+        return parsed
+
+    async def _execute_async(self, command: str, command_obj: Command, command_args, env):
+        result = await self.launcher.run_async(command_args, env)
+        if result.returncode != 0:
+            raise RuntimeError(f"Command {command} failed with error: {result.stderr.decode()}")
+        return command_obj.parse(result.stdout.decode())
+
+    async def _coalesced(self, command: str, command_obj: Command, command_args, env):
+        """
+        Runs a call, or joins an identical call that is already running. The subprocess runs in its own task, so it
+        isn't cancelled if one of the callers waiting for it is.
+        """
+        key = self._call_key(command_args)
+        inflight = self._inflight.get(key)
+        if inflight is None:
+            task = asyncio.ensure_future(self._execute_async(command, command_obj, command_args, env))
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+            inflight = self._inflight[key] = [task, 0]
+        inflight[1] += 1
+        try:
+            result = await asyncio.shield(inflight[0])
+        finally:
+            inflight[1] -= 1
+        # the last caller to resume takes the original, everyone else gets a copy
+        return result if inflight[1] == 0 else _copy_result(result)
+
+    def invalidate_cache_(self, command: str = None):
+        """
+        Drops cached results
+        :param command: the command whose results should be dropped. If None, all cached results are dropped.
+        """
+        commands = self._commands.values() if command is None else [self._get_command(command)]
+        for command_obj in commands:
+            if command_obj.cache is not None:
+                command_obj.cache.invalidate()
+
+    def stream_(self, command: str, *args, **kwargs):
+        """
+        Runs a command and yields records as its output arrives, instead of buffering everything until it exits. This
+        is meant for long-running or very large output, like `kubectl get events --watch`.
+
+        Output is parsed with `cli_wrapper.parsers.Parser.stream`: with a stream parser (e.g. `ndjson`) at the head of
+        the command's parse chain, each record is yielded as soon as it is complete. Without a parser, lines are
+        yielded. Other parsers only produce one record, once the command exits.
+        :param command: the command name, or None for the bare tool
+        :return: an iterator of records (an async iterator if the wrapper is async)
+        """
+        if self.async_:
+            return self._stream_async(command, *args, **kwargs)
+        return self._stream(command, *args, **kwargs)
+
+    def _stream(self, command: str, *args, **kwargs):
+        command_obj, command_args, env = self._prepare(command, args, kwargs)
+        stream = command_obj.parse.stream()
+        decoder = getincrementaldecoder("utf-8")()
+        # stderr goes to a file so a chatty command can't block on a full pipe while we read stdout
+        with (
+            TemporaryFile() as stderr,
+            subprocess.Popen(command_args, stdout=subprocess.PIPE, stderr=stderr, env=env) as proc,
+        ):
+            try:
+                while chunk := proc.stdout.read1(_STREAM_CHUNK_SIZE):
+                    yield from stream.feed(decoder.decode(chunk))
+                yield from stream.feed(decoder.decode(b"", final=True))
+                proc.wait()
+            finally:
+                if proc.poll() is None:
+                    # the caller stopped iterating early
+                    proc.kill()
+            if proc.returncode != 0:
+                stderr.seek(0)
+                raise RuntimeError(f"Command {command} failed with error: {stderr.read().decode()}")
+            yield from stream.close()
+
+    async def _stream_async(self, command: str, *args, **kwargs):
+        command_obj, command_args, env = self._prepare(command, args, kwargs)
+        stream = command_obj.parse.stream()
+        decoder = getincrementaldecoder("utf-8")()
         proc = await asyncio.subprocess.create_subprocess_exec(  # pylint: disable=no-member
             *command_args,
             stdout=asyncio.subprocess.PIPE,
             stderr=asyncio.subprocess.PIPE,
             env=env,
         )
-
-        stdout, stderr = await proc.communicate()
+        # read stderr concurrently so a chatty command can't block on a full pipe while we read stdout
+        stderr = asyncio.ensure_future(proc.stderr.read())
+        try:
+            while chunk := await proc.stdout.read(_STREAM_CHUNK_SIZE):
+                for record in stream.feed(decoder.decode(chunk)):
+                    yield record
+            for record in stream.feed(decoder.decode(b"", final=True)):
+                yield record
+            await proc.wait()
+        finally:
+            if proc.returncode is None:
+                # the caller stopped iterating early
+                proc.kill()
+                await proc.wait()
+                stderr.cancel()
         if proc.returncode != 0:
-            raise RuntimeError(f"Command {command} failed with error: {stderr.decode()}")
-        return command_obj.parse(stdout.decode())
+            raise RuntimeError(f"Command {command} failed with error: {(await stderr).decode()}")
+        for record in stream.close():
+            yield record
 
     def __getattr__(self, item, *args, **kwargs):
         """
@@ -350,14 +627,98 @@ class CLIWrapper:  # pylint: disable=too-many-instance-attributes
         """
         return (self.__getattr__(None))(*args, **kwargs)
 
+    def map_(self, calls, *, max_concurrency: int = None, return_exceptions: bool = True):
+        """
+        Runs many calls, with at most `max_concurrency` subprocesses running at once, and yields results as they
+        complete. Calls are run on a thread pool, or under an asyncio semaphore if the wrapper is async.
+        :param calls: an iterable of `(command, args, kwargs)` tuples. args and kwargs may be omitted, and command may
+          be None to call the bare tool.
+        :param max_concurrency: the number of concurrent subprocesses. Defaults to the wrapper's max_concurrency.
+        :param return_exceptions: if True, a failed call yields its exception in place of a result. Otherwise, the
+          first failure is raised and the remaining calls are cancelled.
+        :return: an iterator (an async iterator if the wrapper is async) of `(index, result)` tuples, where index is
+          the position of the call in `calls`
+        """
+        max_concurrency = self.max_concurrency if max_concurrency is None else max_concurrency
+        calls = [_call_spec(call) for call in calls]
+        if self.async_:
+            return self._map_async(calls, max_concurrency, return_exceptions)
+        return self._map_sync(calls, max_concurrency, return_exceptions)
+
+    def gather_(self, calls, *, max_concurrency: int = None, return_exceptions: bool = True):
+        """
+        Like `map_`, but waits for every call to finish and returns the results in the order of `calls`.
+        :return: a list of results (a coroutine returning the list if the wrapper is async)
+        """
+        max_concurrency = self.max_concurrency if max_concurrency is None else max_concurrency
+        calls = [_call_spec(call) for call in calls]
+        if self.async_:
+            return self._gather_async(calls, max_concurrency, return_exceptions)
+        results = [None] * len(calls)
+        for i, result in self._map_sync(calls, max_concurrency, return_exceptions):
+            results[i] = result
+        return results
+
+    def _map_sync(self, calls, max_concurrency, return_exceptions):
+        pool = ThreadPoolExecutor(max_workers=max_concurrency)
+        try:
+            futures = {
+                pool.submit(self._run, command, *args, **kwargs): i for i, (command, args, kwargs) in enumerate(calls)
+            }
+            for future in as_completed(futures):
+                try:
+                    yield futures[future], future.result()
+                except Exception as err:  # pylint: disable=broad-exception-caught
+                    if not return_exceptions:
+                        raise
+                    yield futures[future], err
+        finally:
+            pool.shutdown(cancel_futures=True)
+
+    async def _bounded_call(self, semaphore, i, call, return_exceptions):
+        command, args, kwargs = call
+        async with semaphore:
+            try:
+                return i, await self._run_async(command, *args, **kwargs)
+            except Exception as err:  # pylint: disable=broad-exception-caught
+                if not return_exceptions:
+                    raise
+                return i, err
+
+    async def _map_async(self, calls, max_concurrency, return_exceptions):
+        semaphore = asyncio.Semaphore(max_concurrency)
+        tasks = [
+            asyncio.ensure_future(self._bounded_call(semaphore, i, call, return_exceptions))
+            for i, call in enumerate(calls)
+        ]
+        try:
+            for task in asyncio.as_completed(tasks):
+                yield await task
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _gather_async(self, calls, max_concurrency, return_exceptions):
+        results = [None] * len(calls)
+        async for i, result in self._map_async(calls, max_concurrency, return_exceptions):
+            results[i] = result
+        return results
+
     @classmethod
-    def from_dict(cls, cliwrapper_dict):
+    def from_dict(cls, cliwrapper_dict, lazy: bool = False):
         """
         Create a CLIWrapper from a dictionary
         :param cliwrapper_dict: the dictionary to be converted
+        :param lazy: if True, each command is only built the first time it is used. "commands" can be any mapping, so
+          its values can be decoded on demand as well.
         :return: CLIWrapper object
         """
         cliwrapper_dict = cliwrapper_dict.copy()
+        command_configs = cliwrapper_dict.pop("commands", {})
+        if lazy:
+            wrapper = CLIWrapper(**cliwrapper_dict)
+            wrapper._command_configs = command_configs
+            return wrapper
         commands = {}
         command_config = {
             "arg_separator": cliwrapper_dict.get("arg_separator", "="),
@@ -365,14 +726,8 @@ class CLIWrapper:  # pylint: disable=too-many-instance-attributes
             "short_prefix": cliwrapper_dict.get("short_prefix", "-"),
             "long_prefix": cliwrapper_dict.get("long_prefix", "--"),
         }
-        for command, config in cliwrapper_dict.pop("commands", {}).items():
-            if isinstance(config, str):
-                config = {"cli_command": config}
-            else:
-                if "cli_command" not in config:
-                    config["cli_command"] = command
-                config = command_config | config
-            commands[command] = Command.from_dict(config)
+        for command, config in command_configs.items():
+            commands[command] = _command_from_config(command, config, command_config)
 
         return CLIWrapper(
             commands=commands,
@@ -387,11 +742,15 @@ class CLIWrapper:  # pylint: disable=too-many-instance-attributes
         return {
             "path": self.path,
             "env": self.env,
-            "commands": {k: v.to_dict() for k, v in self._commands.items()},
+            "commands": {
+                k: self._get_command(k).to_dict() for k in dict.fromkeys(chain(self._command_configs, self._commands))
+            },
             "trusting": self.trusting,
             "async_": self.async_,
             "default_transformer": self.default_transformer,
             "short_prefix": self.short_prefix,
             "long_prefix": self.long_prefix,
             "arg_separator": self.arg_separator,
+            "max_concurrency": self.max_concurrency,
+            "coalesce": self.coalesce,
         }
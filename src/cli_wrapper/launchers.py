@@ -0,0 +1,180 @@
+"""
+Launchers start the subprocesses for a `cli_wrapper.cli_wrapper.CLIWrapper` and collect their output. The wrapper
+uses `SubprocessLauncher` unless it is given another one:
+
+```python
+from cli_wrapper import CLIWrapper
+from cli_wrapper.launchers import ForkServerLauncher
+
+# start the fork server early, while the process is still small
+launcher = ForkServerLauncher()
+...
+kubectl = CLIWrapper("kubectl", launcher=launcher)
+helm = CLIWrapper("helm", launcher=launcher)
+```
+"""
+
+import asyncio
+import logging
+import marshal
+import os
+import selectors
+import socket
+import subprocess
+import sys
+from abc import ABC, abstractmethod
+from concurrent.futures import Future
+from itertools import count
+from pathlib import Path
+from threading import Lock, Thread
+
+_logger = logging.getLogger(__name__)
+
+_HEADER_SIZE = 8
+
+
+class Launcher(ABC):
+    """
+    @public
+    Runs a command to completion and returns a `subprocess.CompletedProcess` with stdout and stderr as bytes.
+    """
+
+    @abstractmethod
+    def run(self, args: list[str], env: dict[str, str] | None) -> subprocess.CompletedProcess:
+        """
+        :param args: the full argv of the command
+        :param env: the environment for the command. None inherits the current environment.
+        :return: the completed process
+        """
+        raise NotImplementedError()
+
+    async def run_async(self, args: list[str], env: dict[str, str] | None) -> subprocess.CompletedProcess:
+        """
+        Async version of `run`. By default, `run` is called in a thread.
+        """
+        return await asyncio.to_thread(self.run, args, env)
+
+    def close(self):
+        """
+        Releases any resources held by the launcher
+        """
+
+
+class SubprocessLauncher(Launcher):
+    """
+    @public
+    Runs commands with `subprocess.run`, or asyncio subprocesses in async mode.
+    """
+
+    def run(self, args, env):
+        return subprocess.run(args, capture_output=True, env=env, check=False)
+
+    async def run_async(self, args, env):
+        proc = await asyncio.subprocess.create_subprocess_exec(  # pylint: disable=no-member
+            *args,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            env=env,
+        )
+        stdout, stderr = await proc.communicate()
+        return subprocess.CompletedProcess(args, proc.returncode, stdout, stderr)
+
+
+class ForkServerLauncher(Launcher):
+    """
+    @public
+    Spawns commands from a small, separate launcher process using `posix_spawn`.
+
+    Forking a process with a large memory footprint is slow, because its page tables have to be copied even if the
+    child immediately execs. The launcher process is a minimal python interpreter started when this object is created,
+    so create it early and share it between wrappers. Output goes straight from the commands to pipes in this process.
+    Commands get /dev/null as stdin. Only available on POSIX systems.
+    """
+
+    def __init__(self):
+        if os.name != "posix":
+            raise RuntimeError("ForkServerLauncher requires a POSIX system")
+        self._ids = count()
+        self._pending: dict[int, Future] = {}
+        self._send_lock = Lock()
+        parent, child = socket.socketpair()
+        with child:
+            self._server = subprocess.Popen(  # pylint: disable=consider-using-with
+                [sys.executable, "-S", (Path(__file__).parent / "_forkserver.py").as_posix(), str(child.fileno())],
+                pass_fds=[child.fileno()],
+                stdin=subprocess.DEVNULL,
+            )
+        self._socket = parent
+        Thread(target=self._read_replies, daemon=True).start()
+
+    def run(self, args, env):
+        if env is None:
+            env = dict(os.environ)
+        stdout_r, stdout_w = os.pipe()
+        stderr_r, stderr_w = os.pipe()
+        try:
+            future = self._submit([os.fspath(a) for a in args], env, stdout_w, stderr_w)
+        finally:
+            os.close(stdout_w)
+            os.close(stderr_w)
+        stdout, stderr = _read_pipes(stdout_r, stderr_r)
+        return subprocess.CompletedProcess(args, future.result(), stdout, stderr)
+
+    def _submit(self, args, env, stdout, stderr) -> Future:
+        request_id = next(self._ids)
+        future = self._pending[request_id] = Future()
+        payload = marshal.dumps((request_id, args, env))
+        with self._send_lock:
+            socket.send_fds(self._socket, [len(payload).to_bytes(_HEADER_SIZE, "big")], [stdout, stderr])
+            self._socket.sendall(payload)
+        return future
+
+    def _read_replies(self):
+        try:
+            while True:
+                size = int.from_bytes(_recv_exactly(self._socket, _HEADER_SIZE), "big")
+                request_id, returncode, error = marshal.loads(_recv_exactly(self._socket, size))
+                future = self._pending.pop(request_id)
+                if error is not None:
+                    future.set_exception(OSError(*error))
+                else:
+                    future.set_result(returncode)
+        except (EOFError, OSError) as err:
+            _logger.debug(f"Fork server connection closed: {err}")
+        for future in self._pending.values():
+            future.set_exception(RuntimeError("The fork server exited"))
+        self._pending.clear()
+
+    def close(self):
+        self._socket.close()
+        self._server.wait()
+
+
+def _recv_exactly(sock, size):
+    data = bytearray()
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise EOFError()
+        data.extend(chunk)
+    return bytes(data)
+
+
+def _read_pipes(*fds) -> list[bytes]:
+    """
+    Reads pipes until they are all closed, then closes them
+    :return: the content of each pipe
+    """
+    output = {fd: [] for fd in fds}
+    with selectors.DefaultSelector() as selector:
+        for fd in fds:
+            selector.register(fd, selectors.EVENT_READ)
+        while selector.get_map():
+            for key, _ in selector.select():
+                chunk = os.read(key.fd, 64 * 1024)
+                if chunk:
+                    output[key.fd].append(chunk)
+                else:
+                    selector.unregister(key.fd)
+                    os.close(key.fd)
+    return [b"".join(output[fd]) for fd in fds]
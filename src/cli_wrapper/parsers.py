@@ -1,4 +1,8 @@
+import json
 import logging
+import re
+from abc import ABC, abstractmethod
+from inspect import unwrap
 
 from .util.callable_chain import CallableChain
 from .util.callable_registry import CallableRegistry
@@ -20,8 +24,196 @@ def extract(src: dict, *args) -> dict:
     return src
 
 
+class StreamParser(ABC):
+    """
+    @public
+    Base class for parsers that consume output incrementally. Chunks of output are passed to `feed` as they arrive,
+    and `close` is called at EOF. Both return a list of the records completed so far.
+
+    Subclasses registered in `parsers` can be used by name as the first parser in a `Parser` chain. They also work on
+    complete output, in which case the chain returns a list of records.
+    """
+
+    streaming = True
+
+    @abstractmethod
+    def feed(self, chunk: str) -> list:
+        """
+        :param chunk: the next chunk of output
+        :return: records completed by this chunk
+        """
+        raise NotImplementedError()
+
+    def close(self) -> list:
+        """
+        Called at EOF
+        :return: any records left in the buffer
+        """
+        return []
+
+
+class LineStream(StreamParser):
+    """
+    Yields output line by line, without line endings. This is what streams produce when there is no parser.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+
+    def feed(self, chunk):
+        lines = (self.buffer + chunk).split("\n")
+        self.buffer = lines.pop()
+        return [line.rstrip("\r") for line in lines]
+
+    def close(self):
+        line, self.buffer = self.buffer, ""
+        return [line] if line else []
+
+
+class NdjsonStream(LineStream):
+    """
+    Parses newline-delimited json, one record per non-empty line.
+    """
+
+    def feed(self, chunk):
+        return [json.loads(line) for line in super().feed(chunk) if line.strip()]
+
+    def close(self):
+        return [json.loads(line) for line in super().close() if line.strip()]
+
+
+_JSON_DELIMITERS = frozenset(" \t\n\r,]}")
+
+
+class JsonItemStream(StreamParser):
+    """
+    Incrementally parses json, yielding:
+     - each item of a top-level array,
+     - each value of a stream of concatenated json values (e.g. `kubectl get --watch --output json`), or
+     - if `key` is given, each item of the array at that key of a top-level object (e.g. `key="items"` for a
+       kubernetes List)
+    """
+
+    _whitespace = re.compile(r"[ \t\n\r]*")
+
+    def __init__(self, key: str = None):
+        self.key = key
+        self.buffer = ""
+        self.pos = 0
+        self.state = "start"
+        self.decoder = json.JSONDecoder()
+
+    def feed(self, chunk):
+        self.buffer = self.buffer[self.pos :] + chunk
+        self.pos = 0
+        records = []
+        while self._step(records, final=False):
+            pass
+        return records
+
+    def close(self):
+        records = []
+        while self._step(records, final=True):
+            pass
+        if self.buffer[self.pos :].strip():
+            # whatever is left is truncated or invalid; let the decoder say why
+            self.decoder.raw_decode(self.buffer, self.pos)
+        return records
+
+    def _skip_whitespace(self):
+        self.pos = self._whitespace.match(self.buffer, self.pos).end()
+        return self.pos < len(self.buffer)
+
+    def _decode(self, final):
+        """
+        :return: a tuple of (complete, value). Values that might continue in the next chunk are not complete.
+        """
+        try:
+            value, end = self.decoder.raw_decode(self.buffer, self.pos)
+        except json.JSONDecodeError:
+            return False, None
+        if not final and self.buffer[end - 1] not in '"]}' and self.buffer[end : end + 1] not in _JSON_DELIMITERS:
+            # a number or literal is only complete once we see what follows it
+            return False, None
+        self.pos = end
+        return True, value
+
+    def _step(self, records, final):  # pylint: disable=too-many-return-statements,too-many-branches
+        """
+        Advances the parser by one token
+        :return: True if progress was made, False if more input is needed
+        """
+        if not self._skip_whitespace():
+            return False
+        char = self.buffer[self.pos]
+        match self.state:
+            case "start":
+                if self.key is not None:
+                    if char != "{":
+                        raise ValueError(f"Expected a json object containing '{self.key}', got '{char}'")
+                    self.state = "keys"
+                elif char == "[":
+                    self.state = "items"
+                else:
+                    self.state = "values"
+                    return True
+                self.pos += 1
+            case "values":
+                complete, value = self._decode(final)
+                if not complete:
+                    return False
+                records.append(value)
+            case "items":
+                if char in "],":
+                    self.pos += 1
+                    self.state = ("keys" if self.key is not None else "start") if char == "]" else "items"
+                    return True
+                complete, value = self._decode(final)
+                if not complete:
+                    return False
+                records.append(value)
+            case "keys":
+                if char in "},":
+                    self.pos += 1
+                    self.state = "start" if char == "}" else "keys"
+                    return True
+                return self._key(records, final)
+        return True
+
+    def _key(self, records, final):
+        """
+        Consumes a key and its value from an object, unless it is the key we're looking for, in which case we stop at
+        the start of its value.
+        """
+        start = self.pos
+        complete, key = self._decode(final)
+        if not complete or not self._skip_whitespace():
+            self.pos = start
+            return False
+        if self.buffer[self.pos] != ":":
+            raise ValueError(f"Expected ':' after json key '{key}'")
+        self.pos += 1
+        if not self._skip_whitespace():
+            self.pos = start
+            return False
+        if key == self.key and self.buffer[self.pos] == "[":
+            self.pos += 1
+            self.state = "items"
+            return True
+        complete, value = self._decode(final)
+        if not complete:
+            self.pos = start
+            return False
+        if key == self.key:
+            records.append(value)
+        return True
+
+
 core_parsers = {
     "extract": extract,
+    "lines": LineStream,
+    "ndjson": NdjsonStream,
+    "json_items": JsonItemStream,
 }
 
 try:
@@ -54,6 +246,38 @@ if "yaml" not in core_parsers:
     except ImportError:  # pragma: no cover
         pass
 
+if "yaml" in core_parsers:
+
+    class YamlDocumentStream(LineStream):
+        """
+        Parses a multi-document yaml stream, one record per document
+        """
+
+        def __init__(self):
+            super().__init__()
+            self.document = []
+
+        def feed(self, chunk):
+            documents = []
+            for line in super().feed(chunk):
+                if line.startswith(("---", "...")):
+                    documents.extend(self._flush())
+                    line = line[3:]
+                self.document.append(line)
+            return documents
+
+        def close(self):
+            self.document.extend(super().close())
+            return self._flush()
+
+        def _flush(self):
+            document, self.document = "\n".join(self.document), []
+            if not document.strip():
+                return []
+            return [yaml_loads(document)]
+
+    core_parsers["yaml_documents"] = YamlDocumentStream
+
 try:
     # https://github.com/josh-paul/dotted_dict -> lets us use dotted notation to access dict keys while preserving
     # the original key names. Syntactic sugar that makes nested dictionaries more palatable.
@@ -81,6 +305,12 @@ core parsers:
  - extract - extracts the specified sub-dictionary from the source dictionary
  - yaml - parses the input as yaml, returns the result (requires ruamel.yaml or pyyaml)
  - dotted_dict - converts an input dictionary to a dotted_dict (requires dotted_dict)
+
+stream parsers (see `StreamParser`):
+ - lines - splits the input into lines
+ - ndjson - parses each line as json
+ - json_items - parses the items of a json array, or a sequence of json values
+ - yaml_documents - parses each document of a multi-document yaml stream (requires ruamel.yaml or pyyaml)
 """
 
 
@@ -94,10 +324,58 @@ class Parser(CallableChain):
     def __init__(self, config):
         super().__init__(config, parsers)
 
+    @property
+    def streaming(self) -> bool:
+        """
+        True if the first parser in the chain is a `StreamParser`
+        """
+        return bool(self.chain) and getattr(unwrap(self.chain[0]), "streaming", False)
+
     def __call__(self, src):
+        if self.streaming:
+            stream = self.stream()
+            return stream.feed(src) + stream.close()
         # For now, parser expects to be called with one input.
         result = src
         for parser in self.chain:
             _logger.debug(result)
             result = parser(result)
         return result
+
+    def stream(self) -> StreamParser:
+        """
+        Creates an incremental parser for this chain. If the first parser in the chain is a `StreamParser`, the rest of
+        the chain is applied to each record it produces. An empty chain produces lines. Otherwise, output is buffered
+        until `close` and parsed as a whole.
+        :return: a `StreamParser`
+        """
+        return _ChainStream(self)
+
+
+class _ChainStream(StreamParser):
+    def __init__(self, parser: Parser):
+        self.parser = parser
+        self.buffer = []
+        self.head = None
+        self.tail = []
+        if not parser.chain:
+            self.head = LineStream()
+        elif parser.streaming:
+            self.head = parser.chain[0]()
+            self.tail = parser.chain[1:]
+
+    def _apply_tail(self, records):
+        for parser in self.tail:
+            records = [parser(record) for record in records]
+        return records
+
+    def feed(self, chunk):
+        if self.head is None:
+            self.buffer.append(chunk)
+            return []
+        return self._apply_tail(self.head.feed(chunk))
+
+    def close(self):
+        if self.head is None:
+            return [self.parser("".join(self.buffer))]
+        return self._apply_tail(self.head.close())
@@ -1,26 +1,96 @@
+import logging
+import marshal
+import os
+import sys
+from collections.abc import Mapping
+from hashlib import sha256
 from json import loads
 from pathlib import Path
 
 from ..cli_wrapper import CLIWrapper
 
+_logger = logging.getLogger(__name__)
 
-def get_wrapper(name, status=None):
+
+def get_wrapper(name, status=None, lazy=False, cache=True):
     """
     Gets a wrapper defined in the beta/stable folders as json.
     :param name: the name of the wrapper to retrieve
     :param status: stable/beta/None. None will search stable and beta
+    :param lazy: if True, commands are only decoded and built the first time they are used
+    :param cache: if True, the config is loaded from a compiled artifact in the user cache directory (see `cache_dir`),
+      which is created from the json on first use. This skips json parsing, and with lazy, decoding unused commands.
     :return: the requested wrapper
     """
     if status is None:
         status = ["stable", "beta"]
     if isinstance(status, str):
         status = [status]
-    wrapper_config = None
+    path = None
     for d in status:
-        path = Path(__file__).parent / d / f"{name}.json"
-        if path.exists():
-            with open(path, "r", encoding="utf-8") as f:
-                wrapper_config = loads(f.read())
-    if wrapper_config is None:
+        candidate = Path(__file__).parent / d / f"{name}.json"
+        if candidate.exists():
+            path = candidate
+    if path is None:
         raise ValueError(f"Wrapper {name} not found")
-    return CLIWrapper.from_dict(wrapper_config)
+    if cache:
+        return CLIWrapper.from_dict(_compiled_config(name, path), lazy=lazy)
+    with open(path, "r", encoding="utf-8") as f:
+        return CLIWrapper.from_dict(loads(f.read()), lazy=lazy)
+
+
+def cache_dir() -> Path:
+    """
+    The directory used to cache artifacts derived from the pre-packaged configs: `$CLI_WRAPPER_CACHE_DIR` if it is
+    set, otherwise `cli_wrapper` in `$XDG_CACHE_HOME` (or `~/.cache`).
+    """
+    if "CLI_WRAPPER_CACHE_DIR" in os.environ:
+        return Path(os.environ["CLI_WRAPPER_CACHE_DIR"])
+    return Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "cli_wrapper"
+
+
+class _MarshalledCommands(Mapping):
+    """
+    Command configs stored as individually marshalled blobs, which are only decoded when they are accessed
+    """
+
+    def __init__(self, blobs: dict[str, bytes]):
+        self.blobs = blobs
+
+    def __getitem__(self, key):
+        return marshal.loads(self.blobs[key])
+
+    def __iter__(self):
+        return iter(self.blobs)
+
+    def __len__(self):
+        return len(self.blobs)
+
+
+def _compiled_config(name: str, path: Path) -> dict:
+    """
+    Loads a wrapper config from its compiled artifact in the cache directory, creating the artifact if needed.
+
+    The artifact is a marshalled dict of the top-level config, with each command config marshalled separately so
+    commands can be decoded one at a time. It is keyed by the hash of the json file and the python version, since the
+    marshal format is specific to the python version.
+    :return: the config for the wrapper, with its commands in a `_MarshalledCommands`
+    """
+    document = path.read_bytes()
+    digest = sha256(document).hexdigest()[:16]
+    artifact_path = cache_dir() / f"{name}-{digest}-py{sys.version_info[0]}{sys.version_info[1]}.marshal"
+    try:
+        artifact = marshal.loads(artifact_path.read_bytes())
+        if not isinstance(artifact, dict):
+            raise ValueError(f"{artifact_path} is not a compiled config")
+    except (OSError, EOFError, ValueError, TypeError):
+        artifact = loads(document)
+        artifact["commands"] = {k: marshal.dumps(v) for k, v in artifact.get("commands", {}).items()}
+        try:
+            artifact_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = artifact_path.with_suffix(f".{os.getpid()}.tmp")
+            tmp_path.write_bytes(marshal.dumps(artifact))
+            tmp_path.replace(artifact_path)
+        except OSError as err:
+            _logger.debug(f"Couldn't write compiled config for wrapper {name}: {err}")
+    return artifact | {"commands": _MarshalledCommands(artifact["commands"])}
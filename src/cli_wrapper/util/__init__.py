@@ -1,4 +1,5 @@
 from cli_wrapper.util.callable_chain import CallableChain
 from cli_wrapper.util.callable_registry import CallableRegistry
+from cli_wrapper.util.result_cache import ResultCache
 
-__all__ = [CallableRegistry.__name__, CallableChain.__name__]
+__all__ = [CallableRegistry.__name__, CallableChain.__name__, ResultCache.__name__]
@@ -1,3 +1,4 @@
+from functools import update_wrapper
 from typing import Callable
 
 from attrs import define
@@ -47,7 +48,8 @@ class CallableRegistry:
                     break
         if callable_ is None:
             raise KeyError(f"{self.callable_name} '{name}' not found.")
-        return lambda *fargs: callable_(*fargs, *args, **kwargs)
+        # update_wrapper lets callers find attributes of the registered callable through __wrapped__
+        return update_wrapper(lambda *fargs: callable_(*fargs, *args, **kwargs), callable_, updated=())
 
     def register(self, name: str, callable_: callable, group="core"):
         """
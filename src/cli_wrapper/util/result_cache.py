@@ -0,0 +1,89 @@
+from collections import OrderedDict
+from threading import Lock
+from time import monotonic
+
+from attrs import define, field
+
+
+@define
+class ResultCache:
+    """
+    An LRU cache of command results, with an optional time to live. @public
+
+    Used by `cli_wrapper.cli_wrapper.Command` when it is configured with `cache`. Keys are built by the wrapper from
+    the full argv and environment of a call.
+    """
+
+    ttl: float | None = None
+    """ seconds before an entry expires. None means entries only leave the cache by eviction or invalidation """
+    max_entries: int = 128
+    """ the least recently used entry is evicted when the cache grows past this """
+    hits: int = field(init=False, default=0)
+    """ the number of lookups that found a live entry """
+    misses: int = field(init=False, default=0)
+    """ the number of lookups that didn't """
+    _entries: OrderedDict = field(init=False, factory=OrderedDict, repr=False, eq=False)
+    _lock: Lock = field(init=False, factory=Lock, repr=False, eq=False)
+
+    @classmethod
+    def from_dict(cls, cache_dict: dict | bool | None):
+        """
+        Create a ResultCache from its configuration.
+        :param cache_dict: a dict of `ttl` and `max_entries`, True for the defaults, or None/False for no cache
+        :return: ResultCache object or None
+        """
+        if cache_dict is None or cache_dict is False:
+            return None
+        if isinstance(cache_dict, ResultCache):
+            return cache_dict
+        if cache_dict is True:
+            return ResultCache()
+        return ResultCache(**cache_dict)
+
+    def to_dict(self):
+        """
+        Convert the ResultCache configuration to a dictionary. Entries and counters are not included.
+        """
+        return {"ttl": self.ttl, "max_entries": self.max_entries}
+
+    def get(self, key, default=None):
+        """
+        :param key: the key to look up
+        :param default: returned if there is no live entry for the key
+        :return: the cached value, or default
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (entry[0] is None or entry[0] > monotonic()):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        """
+        Stores a value, evicting the least recently used entries if the cache is full
+        """
+        expires = monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._entries[key] = (expires, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key=None):
+        """
+        Removes an entry from the cache
+        :param key: the key to remove. If None, all entries are removed.
+        """
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,31 @@
+from cli_wrapper.pre_packaged import get_wrapper
+
+
+def test_lazy_wrapper(tmp_path, monkeypatch):
+    monkeypatch.setenv("CLI_WRAPPER_CACHE_DIR", (tmp_path / "cache").as_posix())
+    kubectl = get_wrapper("kubectl", lazy=True)
+    assert not kubectl._commands
+    assert kubectl._get_command("get").cli_command == ["get"]
+    assert list(kubectl._commands) == ["get"]
+    assert get_wrapper("kubectl", lazy=True, cache=False).to_dict() == get_wrapper("kubectl", cache=False).to_dict()
+
+
+def test_compiled_config(tmp_path, monkeypatch):
+    monkeypatch.setenv("CLI_WRAPPER_CACHE_DIR", (tmp_path / "cache").as_posix())
+    expected = get_wrapper("helm", cache=False).to_dict()
+    assert get_wrapper("helm").to_dict() == expected
+    artifacts = list((tmp_path / "cache").glob("helm-*.marshal"))
+    assert len(artifacts) == 1
+
+    # the second load uses the artifact
+    assert get_wrapper("helm").to_dict() == expected
+    assert get_wrapper("helm", lazy=True).to_dict() == expected
+
+    # a corrupt artifact is rebuilt
+    artifacts[0].write_bytes(b"garbage")
+    assert get_wrapper("helm").to_dict() == expected
+
+    # an unusable cache directory means the artifact is built in memory
+    (tmp_path / "file").touch()
+    monkeypatch.setenv("CLI_WRAPPER_CACHE_DIR", (tmp_path / "file").as_posix())
+    assert get_wrapper("helm", lazy=True)._get_command("list").cli_command == ["list"]
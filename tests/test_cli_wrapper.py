@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from json import loads
 from pathlib import Path
@@ -141,6 +142,25 @@ class TestCommand:
 
         assert command.build_args("pod", foo="bar") == ["get", "pod", "--food=bar"]
 
+    def test_command_compile(self):
+        command = Command(cli_command="get", default_flags={"output": "json"}, args={"foo": {"literal_name": "food"}})
+        builder = command.compile()
+        assert command.compile() is builder
+        assert command.build_args("pods", foo="bar", all_namespaces=True) == [
+            "get",
+            "pods",
+            "--food=bar",
+            "--all-namespaces",
+            "--output=json",
+        ]
+
+        # setting any attribute discards the compiled builder
+        command.arg_separator = " "
+        assert command.compile() is not builder
+        assert command.build_args("pods", o="yaml") == ["get", "pods", "-o", "yaml", "--output", "json"]
+        command.default_flags = {}
+        assert command.build_args("pods") == ["get", "pods"]
+
 
 class TestCLIWrapper:
     def test_cliwrapper(self):
@@ -235,3 +255,119 @@ class TestCLIWrapper:
             cliwrapper._commands["get"].validate_args("pods", "my_cool_pod!!")
         with pytest.raises(ValueError):
             cliwrapper.get("pods", "my_cool_pod!!")
+
+    def test_gather(self):
+        fake_kubectl = Path(__file__).parent / "data/fake_kubectl"
+        kubectl = CLIWrapper(fake_kubectl.as_posix(), max_concurrency=2)
+        kubectl.update_command_("get", default_flags={"output": "json"}, parse="json")
+        calls = [("get", ["pod", f"pod-{i}"]) for i in range(5)] + [("fake", [], {"namespace": "default"})]
+
+        results = kubectl.gather_(calls)
+        assert [r["metadata"]["name"] for r in results[:5]] == [f"pod-{i}" for i in range(5)]
+        assert isinstance(results[5], RuntimeError)
+
+        results = dict(kubectl.map_(calls, max_concurrency=4))
+        assert sorted(results) == list(range(6))
+        assert results[3]["metadata"]["name"] == "pod-3"
+
+        with pytest.raises(RuntimeError):
+            kubectl.gather_(calls, return_exceptions=False)
+
+    @pytest.mark.asyncio
+    async def test_gather_async(self):
+        fake_kubectl = Path(__file__).parent / "data/fake_kubectl"
+        kubectl = CLIWrapper(fake_kubectl.as_posix(), async_=True, max_concurrency=2)
+        kubectl.update_command_("get", default_flags={"output": "json"}, parse="json")
+        calls = [("get", ["pod", f"pod-{i}"]) for i in range(5)] + ["fake"]
+
+        results = await kubectl.gather_(calls)
+        assert [r["metadata"]["name"] for r in results[:5]] == [f"pod-{i}" for i in range(5)]
+        assert isinstance(results[5], RuntimeError)
+
+        results = {i: r async for i, r in kubectl.map_(calls)}
+        assert sorted(results) == list(range(6))
+
+        with pytest.raises(RuntimeError):
+            await kubectl.gather_(calls, return_exceptions=False)
+
+    def test_stream(self):
+        fake_kubectl = Path(__file__).parent / "data/fake_kubectl"
+        kubectl = CLIWrapper(fake_kubectl.as_posix())
+        kubectl.update_command_("get", parse=["ndjson", {"extract": ["metadata", "name"]}])
+        assert list(kubectl.stream_("get", "events", watch=True)) == ["event-1", "event-2", "event-3"]
+
+        # without a parser, lines are yielded
+        assert list(kubectl.stream_("describe", "pods")) == ["some output or other"]
+        # stopping early is fine
+        assert next(iter(kubectl.stream_("get", "events"))) == "event-1"
+
+        with pytest.raises(RuntimeError):
+            list(kubectl.stream_("fake"))
+
+    @pytest.mark.asyncio
+    async def test_stream_async(self):
+        fake_kubectl = Path(__file__).parent / "data/fake_kubectl"
+        kubectl = CLIWrapper(fake_kubectl.as_posix(), async_=True)
+        kubectl.update_command_("get", parse=["ndjson", {"extract": ["metadata", "name"]}])
+        assert [r async for r in kubectl.stream_("get", "events")] == ["event-1", "event-2", "event-3"]
+
+        with pytest.raises(RuntimeError):
+            _ = [r async for r in kubectl.stream_("fake")]
+
+    def test_result_cache(self):
+        fake_kubectl = Path(__file__).parent / "data/fake_kubectl"
+        kubectl = CLIWrapper(fake_kubectl.as_posix())
+        kubectl.update_command_("get", default_flags={"output": "json"}, parse="json", cache={"ttl": 60})
+        cache = kubectl._commands["get"].cache
+
+        first = kubectl.get("pod", "pod-1")
+        second = kubectl.get("pod", "pod-1")
+        assert first == second
+        # callers get their own copy
+        assert first is not second
+        kubectl.get("pod", "pod-2")
+        assert (cache.hits, cache.misses) == (1, 2)
+
+        # changing the environment changes the key
+        kubectl.env = {"KUBECONFIG": "/dev/null"}
+        kubectl.get("pod", "pod-1")
+        assert cache.misses == 3
+
+        kubectl.invalidate_cache_("get")
+        assert len(cache) == 0
+
+        with pytest.raises(ValueError):
+            kubectl.update_command_("delete", cache=True)
+        with pytest.raises(ValueError):
+            kubectl.update_command_("config_set_context", cli_command=["config", "set-context"], cache=True)
+
+    @pytest.mark.asyncio
+    async def test_coalesce(self, monkeypatch):
+        fake_kubectl = Path(__file__).parent / "data/fake_kubectl"
+        kubectl = CLIWrapper(fake_kubectl.as_posix(), async_=True, coalesce=True)
+        kubectl.update_command_("get", default_flags={"output": "json"}, parse="json")
+
+        calls = []
+        execute_async = CLIWrapper._execute_async
+
+        async def counting_execute_async(self, command, command_obj, command_args, env):
+            calls.append(command_args)
+            return await execute_async(self, command, command_obj, command_args, env)
+
+        monkeypatch.setattr(CLIWrapper, "_execute_async", counting_execute_async)
+
+        results = await asyncio.gather(*[kubectl.get("pod", "pod-1") for _ in range(10)], kubectl.get("pod", "pod-2"))
+        assert len(calls) == 2
+        assert all(r["metadata"]["name"] == "pod-1" for r in results[:10])
+        # every caller has its own copy
+        assert len({id(r) for r in results}) == 11
+        assert not kubectl._inflight
+
+        # failures are shared too
+        with pytest.raises(RuntimeError):
+            await asyncio.gather(kubectl.fake(), kubectl.fake())
+        assert len(calls) == 3
+
+        kubectl.coalesce = False
+        await asyncio.gather(kubectl.get("pod", "pod-1"), kubectl.get("pod", "pod-1"))
+        assert len(calls) == 5
@@ -0,0 +1,46 @@
+from pathlib import Path
+
+import pytest
+
+from cli_wrapper.cli_wrapper import CLIWrapper
+from cli_wrapper.launchers import ForkServerLauncher, SubprocessLauncher
+
+fake_kubectl = (Path(__file__).parent / "data/fake_kubectl").as_posix()
+
+
+@pytest.fixture(name="fork_server")
+def fixture_fork_server():
+    launcher = ForkServerLauncher()
+    yield launcher
+    launcher.close()
+
+
+@pytest.mark.parametrize("launcher_type", [SubprocessLauncher, ForkServerLauncher])
+def test_launcher(launcher_type):
+    launcher = launcher_type()
+    result = launcher.run(["sh", "-c", "echo out; echo err >&2; exit 3"], None)
+    assert (result.returncode, result.stdout, result.stderr) == (3, b"out\n", b"err\n")
+
+    result = launcher.run(["sh", "-c", "echo $CLI_WRAPPER_TEST"], {"CLI_WRAPPER_TEST": "value"})
+    assert result.stdout == b"value\n"
+
+    with pytest.raises(FileNotFoundError):
+        launcher.run(["/does/not/exist"], None)
+    launcher.close()
+
+
+def test_fork_server_wrapper(fork_server):
+    kubectl = CLIWrapper(fake_kubectl, launcher=fork_server)
+    kubectl.update_command_("get", default_flags={"output": "json"}, parse="json")
+    # concurrent calls share the fork server
+    results = kubectl.gather_([("get", ["pod", f"pod-{i}"]) for i in range(20)], max_concurrency=8)
+    assert [r["metadata"]["name"] for r in results] == [f"pod-{i}" for i in range(20)]
+    with pytest.raises(RuntimeError):
+        kubectl.fake()
+
+
+@pytest.mark.asyncio
+async def test_fork_server_async(fork_server):
+    kubectl = CLIWrapper(fake_kubectl, launcher=fork_server, async_=True)
+    kubectl.update_command_("get", default_flags={"output": "json"}, parse="json")
+    assert (await kubectl.get("pods"))["kind"] == "List"
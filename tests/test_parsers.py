@@ -106,3 +106,35 @@ class TestParsers:
             parsers.get("custom_group.non_existing_parser")
         with pytest.raises(KeyError):
             parsers.get("too.many.dots.in.name")
+
+    def test_stream_parsers(self):
+        def feed_bytewise(parser, data):
+            stream = parser.stream()
+            records = []
+            for c in data:
+                records.extend(stream.feed(c))
+            return records + stream.close()
+
+        testdata = '{"kind": "List", "items": [{"a": [1, 2]}, 22, 3.5, "x]", true], "metadata": {}}'
+        parser = Parser({"json_items": {"key": "items"}})
+        assert feed_bytewise(parser, testdata) == [{"a": [1, 2]}, 22, 3.5, "x]", True]
+        assert parser(testdata) == [{"a": [1, 2]}, 22, 3.5, "x]", True]
+
+        # concatenated values, like kubectl get --watch --output json
+        assert feed_bytewise(Parser("json_items"), '{"a": 1}\n{"b": [2]} 12 [1]') == [{"a": 1}, {"b": [2]}, 12, [1]]
+        assert feed_bytewise(Parser("json_items"), "[1, 2.5e3, null]") == [1, 2500.0, None]
+        with pytest.raises(ValueError):
+            feed_bytewise(Parser("json_items"), '[1, {"a": ')
+
+        # the rest of the chain is applied to each record
+        parser = Parser(["ndjson", {"extract": ["a"]}])
+        assert feed_bytewise(parser, '{"a": 1}\n\n{"a": 2}') == [1, 2]
+
+        assert feed_bytewise(Parser("yaml_documents"), "a: 1\n---\nb: 2\n---\n") == [{"a": 1}, {"b": 2}]
+        assert feed_bytewise(Parser(None), "a\nb\r\nc") == ["a", "b", "c"]
+
+        # other parsers see the whole output at close
+        stream = Parser(["json", {"extract": ["foo"]}]).stream()
+        assert stream.feed('{"foo": ') == []
+        assert stream.feed('"bar"}') == []
+        assert stream.close() == ["bar"]
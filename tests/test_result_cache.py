@@ -0,0 +1,37 @@
+from time import sleep
+
+from cli_wrapper.util.result_cache import ResultCache
+
+
+def test_result_cache():
+    cache = ResultCache(max_entries=2)
+    assert cache.get("a") is None
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    # b is now the least recently used
+    cache.put("c", 3)
+    assert cache.get("b", "missing") == "missing"
+    assert cache.get("c") == 3
+    assert (cache.hits, cache.misses) == (2, 2)
+
+    cache.invalidate("a")
+    assert cache.get("a") is None
+    cache.invalidate()
+    assert len(cache) == 0
+
+    cache = ResultCache(ttl=0.05)
+    cache.put("a", 1)
+    assert cache.get("a") == 1
+    sleep(0.1)
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_result_cache_from_dict():
+    assert ResultCache.from_dict(None) is None
+    assert ResultCache.from_dict(False) is None
+    assert ResultCache.from_dict(True) == ResultCache()
+    cache = ResultCache.from_dict({"ttl": 10, "max_entries": 5})
+    assert cache.to_dict() == {"ttl": 10, "max_entries": 5}
+    assert ResultCache.from_dict(cache) is cache
@@ -8,6 +8,7 @@ class TestSerialization:
             "get",
             default_flags={"output": "json"},
             parse="json",
+            cache={"ttl": 30, "max_entries": 10},
             args={
                 "namespace": {"validator": ["is_alnum", "starts_alpha"]},
             },
@@ -18,6 +19,7 @@ class TestSerialization:
         kubectl2 = CLIWrapper.from_dict(config)
 
         assert kubectl2.to_dict() == config
+        assert kubectl2._commands["get"].cache.ttl == 30
 
     def test_argument_to_dict(self):
         arg = Argument(